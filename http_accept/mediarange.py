@@ -0,0 +1,734 @@
+"""Media-range types: MediaRange, FrozenMediaRange and HeaderAccept"""
+import re
+from decimal import Decimal as D
+from types import MappingProxyType
+
+
+HTML_MIMETYPES = [
+    'text/html',
+    'application/xhtml',
+    'application/xhtml+xml'
+]
+
+_TOKEN_RE = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+\Z")
+
+
+def _quote(value):
+    """Return value as a token if possible, or as a quoted-string."""
+    if _TOKEN_RE.match(value):
+        return value
+    return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _split_mimetype(mimetype):
+    """Return the ``(type, subtype)`` pair of a mimetype."""
+    main_type, _, sub_type = mimetype.partition('/')
+    return main_type, sub_type
+
+
+def _options_compatible(options, other_options):
+    """Return True if two options dicts do not give different values to the
+    same key."""
+    return all(
+        other_options[key] == value
+        for key, value in options.items()
+        if key in other_options
+    )
+
+
+def _range_key(mimetype, options):
+    """Return a hashable key for a mimetype and its options."""
+    return mimetype, frozenset(options.items())
+
+
+class MediaRange(object):
+    """Represent a media-range of an HTTP Accept header.
+
+    RFC 2616, section 14.1 defines Accept header as a list of ``media-range``
+    elements (either ``*/*``, ``type/*``, or ``type/subtype``) with parameters.
+
+    A MediaRange is composed of a mimetype and a list of options, such as ``q``
+    (reserved key), or any custom key. An HTTP server may use one, both, or
+    none of any information from a media-range.
+
+    A MediaRange can be compared and sorted in a list of MediaRange objects.
+
+    This class can be easily combined with ``parse_accept_value`` to be
+    instantiated:
+
+        >>> from http_accept import parse_accept_value
+        >>> info = parse_accept_value('text/html;q=0.8;level=1')
+        >>> mimetype = info.get('mimetype')
+        >>> options = info.get('options', {})
+        >>> media = MediaRange(mimetype, **options)
+        >>> media.mimetype
+        'text/html'
+        >>> media.quality
+        Decimal('0.8')
+        >>> media.options
+        {'level': '1'}
+
+    """
+    def __init__(self, mimetype, **options):
+        """Build with a mimetype and options.
+
+        The specific parameter ``q`` is saved into the ``quality`` attribute,
+        while all options are kept in ``options`` attribute (including ``q``).
+
+        If the ``q`` parameter does not exist, the default value 1.0 is assumed
+        but the ``options`` attribute won't contain it.
+
+        """
+        self.mimetype = mimetype
+        self._quality = D(options.get('q', 1.0)) if 'q' in options else D(1.0)
+        self._raw_options = options
+        self._options = {
+            key: value
+            for key, value in options.items()
+            if 'q' != key
+        }
+
+    def __eq__(self, other):
+        """Return if other is considered equal to self.
+
+        They are equal if they have the same ``mimetype``, ``quality`` and
+        ``options``.
+
+        """
+        if (not hasattr(other, 'mimetype')
+            or not hasattr(other, 'quality')
+            or not hasattr(other, 'options')):
+            return False
+
+        return (
+            self.mimetype == other.mimetype
+            and self.quality == other.quality
+            and self.options == other.options
+        )
+
+    def __ne__(self, other):
+        """Return if other is not considered equal to self.
+
+        They are not equal if other has not the same ``mimetype`` nor
+        ``quality`` values nor ``options``.
+
+        """
+        if (not hasattr(other, 'mimetype')
+            or not hasattr(other, 'quality')
+            or not hasattr(other, 'options')):
+            return True
+
+        return (
+            self.mimetype != other.mimetype
+            or self.quality != other.quality
+            or self.options != other.options
+        )
+
+    def __lt__(self, other):
+        """Return if self's quality is lower than other's quality.
+
+        This method will only be able to compare with other with a ``quality``
+        attribute. One may use duck typing to compare two instances of
+        different classes without error.
+
+        """
+        if not hasattr(other, 'quality'):
+            raise TypeError('unorderable types: %s < %s'
+                            % (type(self), type(other)))
+
+        return self.quality < other.quality
+
+    def __le__(self, other):
+        """Return if self's quality is lower or equal than other's quality.
+
+        This method will only be able to compare with other with a ``quality``
+        attribute. One may use duck typing to compare two instances of
+        different classes without error.
+
+        """
+        if not hasattr(other, 'quality'):
+            raise TypeError('unorderable types: %s <= %s'
+                            % (type(self), type(other)))
+
+        return self.quality <= other.quality
+
+    def __gt__(self, other):
+        """Return if self's quality is greater than other's quality.
+
+        This method will only be able to compare with other with a ``quality``
+        attribute. One may use duck typing to compare two instances of
+        different classes without error.
+
+        """
+        if not hasattr(other, 'quality'):
+            raise TypeError('unorderable types: %s > %s'
+                            % (type(self), type(other)))
+
+        return self.quality > other.quality
+
+    def __ge__(self, other):
+        """Return if self's quality is greater or equal than other's quality.
+
+        This method will only be able to compare with other with a ``quality``
+        attribute. One may use duck typing to compare two instances of
+        different classes without error.
+
+        """
+        if not hasattr(other, 'quality'):
+            raise TypeError('unorderable types: %s >= %s'
+                            % (type(self), type(other)))
+
+        return self.quality >= other.quality
+
+    @property
+    def quality(self):
+        """Read-only quality parameter."""
+        return self._quality
+
+    @property
+    def options(self):
+        """Read-only options parameter.
+
+        This attribute does not contains the ``q`` parameter.
+
+        """
+        return self._options
+
+    def set_options(self, key, value):
+        """Set an option's value.
+        """
+        if key == 'q':
+            if self._quality != value:
+                fixed_decimal_value = D(value)
+                self._quality = fixed_decimal_value
+                self._raw_options['q'] = fixed_decimal_value
+        else:
+            self._raw_options[key] = value
+            self._options[key] = value
+
+    def to_http(self, explicit_quality=False):
+        """Return the string value of the media-range suitable for HTTP Accept.
+
+        The ``q`` parameter will be always displayed first in the list of
+        parameters. By default, if the ``q`` is not from the source options,
+        it won't appear in the result. This behavior can be changed by using
+        ``explicit_quality=True``::
+
+            >>> MediaRange('text/html', q=1.0).to_http()
+            'text/html;q=1.0'
+            >>> MediaRange('text/html').to_http()
+            'text/html'
+            >>> MediaRange('text/html').to_http(explicit_quality=True)
+            'text/html;q=1.0'
+            >>> MediaRange('text/html', aaa='1').to_http(explicit_quality=True)
+            'text/html;q=1.0;aaa=1'
+
+        """
+        # Manage to have always `q` as first parameter
+        if explicit_quality or 'q' in self._raw_options:
+            # Keep up to the 3 decimals allowed by RFC 7231, section 5.3.1
+            quality = self.quality.quantize(D('0.001')).normalize()
+            if quality.as_tuple().exponent > -1:
+                quality = quality.quantize(D('0.1'))
+            base = ['q=%s' % quality]
+        else:
+            base = []
+
+        options = [
+            '='.join([key, _quote(value)])
+            for key, value in sorted(self._options.items())
+        ]
+
+        return ';'.join(
+            [self.mimetype] + base + options
+        )
+
+
+class FrozenMediaRange(MediaRange):
+    """Immutable MediaRange
+
+    A FrozenMediaRange can not be modified once built: its attributes can not
+    be set, ``set_options`` raises a TypeError, and its ``options`` are a
+    read-only mapping. It can then be shared between several HeaderAccept
+    instances, and it is hashable.
+
+    """
+    def __init__(self, mimetype, **options):
+        """Build with a mimetype and options, then freeze the instance."""
+        super(FrozenMediaRange, self).__init__(mimetype, **options)
+        object.__setattr__(
+            self, '_raw_options', MappingProxyType(self._raw_options)
+        )
+        object.__setattr__(self, '_options', MappingProxyType(self._options))
+        object.__setattr__(self, '_frozen', True)
+
+    def __setattr__(self, name, value):
+        """Forbid to set attributes once the instance is frozen."""
+        if getattr(self, '_frozen', False):
+            raise TypeError(
+                '\'%s\' object does not support attribute assignment'
+                % type(self).__name__
+            )
+        super(FrozenMediaRange, self).__setattr__(name, value)
+
+    def __hash__(self):
+        """Return a hash consistent with ``__eq__``."""
+        return hash((
+            self.mimetype, self.quality, frozenset(self.options.items())
+        ))
+
+    def set_options(self, key, value):
+        """Forbid to set an option's value."""
+        raise TypeError(
+            '\'%s\' object does not support options assignment'
+            % type(self).__name__
+        )
+
+
+class HeaderAccept(list):
+    """Smart list of MediaRange with specific behaviors
+
+    HeaderAccept overrides the contains list's behavior to be able to
+    compare properly two (or kind of) MediaRange.
+
+    One can use it like this:
+
+        >>> accept_html = MediaRange('text/html', q=1.0)
+        >>> accept_text = MediaRange('text/*', q=0.9)
+        >>> accept_wildcard = MediaRange('*/*', q=0.8)
+        >>> accepts = HeaderAccept([
+        ...     accept_html, accept_text, accept_wildcard
+        ... ])
+        >>> accepts.max_quality
+        Decimal('1')
+        >>> 'text/html' in accepts
+        True
+        >>> accepts.is_html_accepted()
+        True
+
+    """
+    # Maximum number of Content-Type results cached by ``accepts``
+    accepts_cache_size = 32
+
+    def __init__(self, *args, **kwargs):
+        """Build the list and extract the max quality value"""
+        list.__init__(self, *args, **kwargs)
+        self.max_quality = max([item.quality for item in self] or [D(0)])
+        self._index = None
+        self._accepted = {}
+
+    def __contains__(self, value):
+        """Override contains to compare with a mimetype and a quality
+
+        The comparison is done with an equality between the value provided
+        and any item in self. The ``value`` might not be an instance of
+        MediaRange, but as long as it implements an __eq__ method,
+        it might be compared with any other MediaRange-like object
+        contained into self.
+
+        If ``value`` doesn't have ``mimetype`` or ``quality`` attributes,
+        this method will try to unpack a two-value iterable (tuple or list),
+        and then compare with any item's mimetype and item's quality.
+
+        Finally, if none of these can be done, the value will be compare with
+        any item's mimetype.
+
+        """
+        if (hasattr(value, 'mimetype')
+            and hasattr(value, 'quality')
+            and hasattr(value, 'options')):
+            return any(
+                # Will call value.__eq__(item)
+                # If value does not override __eq__
+                # this should always returns False
+                value == item
+                for item in self
+            )
+
+        # Try with a (mimetype, quality) value
+        try:
+            mimetype, quality = value
+        except ValueError:
+            # Can not unpack value... too bad but we can ignore this case.
+            pass
+        else:
+            d_quality = D(quality)  # We don't need to catch errors here
+            return any(
+                mimetype == item.mimetype and d_quality == item.quality
+                for item in self
+            )
+
+        # Guess the value is a string to compare with any item's mimetype
+        return any(
+            value == item.mimetype
+            for item in self
+        )
+
+    def append(self, x):
+        """Override append to update max_quality on list update."""
+        if not hasattr(x, 'quality') or not hasattr(x, 'mimetype'):
+            raise TypeError(
+                'append() only accept object with '
+                'a \'quality\' and a \'mimetype\' attribute, '
+                'not \'%s\'' % type(x)
+            )
+
+        if self.max_quality < x.quality:
+            self.max_quality = x.quality
+
+        self._index = None
+        self._accepted = {}
+        return super(HeaderAccept, self).append(x)
+
+    def _updated(self):
+        """Update max_quality and drop cached lookups after a list update."""
+        self.max_quality = max([item.quality for item in self] or [D(0)])
+        self._index = None
+        self._accepted = {}
+
+    def extend(self, iterable):
+        """Override extend to update max_quality on list update."""
+        super(HeaderAccept, self).extend(iterable)
+        self._updated()
+
+    def insert(self, index, x):
+        """Override insert to update max_quality on list update."""
+        super(HeaderAccept, self).insert(index, x)
+        self._updated()
+
+    def remove(self, x):
+        """Override remove to update max_quality on list update."""
+        super(HeaderAccept, self).remove(x)
+        self._updated()
+
+    def pop(self, *args):
+        """Override pop to update max_quality on list update."""
+        item = super(HeaderAccept, self).pop(*args)
+        self._updated()
+        return item
+
+    def clear(self):
+        """Override clear to update max_quality on list update."""
+        super(HeaderAccept, self).clear()
+        self._updated()
+
+    def sort(self, *args, **kwargs):
+        """Override sort to drop cached lookups, which depend on order."""
+        super(HeaderAccept, self).sort(*args, **kwargs)
+        self._updated()
+
+    def reverse(self):
+        """Override reverse to drop cached lookups, which depend on order."""
+        super(HeaderAccept, self).reverse()
+        self._updated()
+
+    def __setitem__(self, index, value):
+        """Override item assignment to update max_quality on list update."""
+        super(HeaderAccept, self).__setitem__(index, value)
+        self._updated()
+
+    def __delitem__(self, index):
+        """Override item deletion to update max_quality on list update."""
+        super(HeaderAccept, self).__delitem__(index)
+        self._updated()
+
+    def __iadd__(self, other):
+        """Override ``+=`` to update max_quality on list update."""
+        result = super(HeaderAccept, self).__iadd__(other)
+        self._updated()
+        return result
+
+    def __imul__(self, value):
+        """Override ``*=`` to update max_quality on list update."""
+        result = super(HeaderAccept, self).__imul__(value)
+        self._updated()
+        return result
+
+    def to_http(self):
+        """Return the HTTP Header string value of the Accept header list"""
+        return ','.join(
+            value.to_http() for value in sorted(self, reverse=True)
+        )
+
+    def get_max_quality_accept(self):
+        """Return a new instance of self's class with only max quality accepts
+
+        This method can be used to retrieve only the top-level accepted
+        mimetype in order to perform the first level of content negotiation.
+
+        """
+        return self.__class__(
+            item
+            for item in self
+            if item.quality == self.max_quality
+        )
+
+    def is_html_accepted(self, strict=False):
+        """Return True if HTML is an accepted type for this list."""
+        mimetypes_compare = HTML_MIMETYPES
+
+        if not strict:
+            mimetypes_compare = HTML_MIMETYPES + [
+                'text/*', 'application/*', '*/*'
+            ]
+
+        return any(accept_value in self for accept_value in (
+            MediaRange(mimetype, q=self.max_quality)
+            for mimetype in mimetypes_compare
+        ))
+
+    def accepts(self, content_type):
+        """Return the quality given to a response's Content-Type.
+
+        The most specific media-range matching the Content-Type's mimetype
+        and parameters gives the quality, and a null quality means the
+        Content-Type is not acceptable:
+
+            >>> from http_accept import parse_accept_header
+            >>> accepts = parse_accept_header('text/*;q=0.5, text/html;level=1')
+            >>> accepts.accepts('text/html; level=1; charset=utf-8')
+            Decimal('1')
+            >>> accepts.accepts('text/html')
+            Decimal('0.5')
+            >>> accepts.accepts('image/png')
+            Decimal('0')
+
+        A malformed Content-Type is not acceptable, so it gives a null
+        quality instead of raising an error. Every parameter of the
+        Content-Type is matched as a parameter, ``q`` included.
+
+        Results are cached by Content-Type until self is updated, and the
+        cache is emptied once it holds ``accepts_cache_size`` results.
+
+        """
+        try:
+            return self._accepted[content_type]
+        except KeyError:
+            pass
+
+        from .parser import parse_accept_value  # Avoid a circular import
+
+        try:
+            info = parse_accept_value(content_type)
+        except (TypeError, ValueError):
+            info = None
+
+        if info is None or '/' not in info['mimetype']:
+            quality = D(0)
+        else:
+            quality = self._quality_of(
+                info['mimetype'], info['options']
+            ) or D(0)
+
+        if len(self._accepted) >= self.accepts_cache_size:
+            self._accepted.clear()
+        self._accepted[content_type] = quality
+
+        return quality
+
+    def _get_index(self):
+        """Return the (cached) index of self's items.
+
+        The index is a tuple of two dicts: items by ``mimetype``, and items
+        with a concrete subtype by main type. It is built once and dropped on
+        ``append``, so set operations only walk each list once.
+
+        """
+        if self._index is None:
+            by_mimetype = {}
+            by_type = {}
+            for item in self:
+                by_mimetype.setdefault(item.mimetype, []).append(item)
+                main_type, sub_type = _split_mimetype(item.mimetype)
+                if main_type != '*' and sub_type != '*':
+                    by_type.setdefault(main_type, []).append(item)
+            self._index = (by_mimetype, by_type)
+        return self._index
+
+    def _quality_of(self, mimetype, options):
+        """Return the quality self gives to a mimetype with options.
+
+        As stated by RFC 2616, section 14.1, the most specific media-range
+        that matches takes precedence: ``type/subtype`` with the most matching
+        parameters first, then ``type/*``, then ``*/*``. Return None when
+        nothing matches.
+
+        """
+        by_mimetype = self._get_index()[0]
+        main_type, sub_type = _split_mimetype(mimetype)
+        lookups = [mimetype]
+        if main_type != '*':
+            if sub_type != '*':
+                lookups.append('%s/*' % main_type)
+            lookups.append('*/*')
+
+        for lookup in lookups:
+            matches = [
+                item
+                for item in by_mimetype.get(lookup, [])
+                if all(
+                    options.get(key) == value
+                    for key, value in item.options.items()
+                )
+            ]
+            if matches:
+                return max(
+                    matches, key=lambda item: len(item.options)
+                ).quality
+
+        return None
+
+    def _overlapping(self, item):
+        """Return self's items that overlap with ``item``'s media-range."""
+        by_mimetype, by_type = self._get_index()
+        main_type, sub_type = _split_mimetype(item.mimetype)
+
+        if main_type == '*':
+            candidates = list(self)
+        else:
+            candidates = (
+                by_mimetype.get(item.mimetype, [])
+                + by_mimetype.get('*/*', [])
+            )
+            if sub_type == '*':
+                candidates = by_type.get(main_type, []) + candidates
+            else:
+                candidates = by_mimetype.get('%s/*' % main_type, []) + candidates
+
+        return [
+            candidate
+            for candidate in candidates
+            if _options_compatible(item.options, candidate.options)
+        ]
+
+    def _from_ranges(self, ranges):
+        """Build a new instance of self's class from (mimetype, options,
+        quality) tuples."""
+        result = self.__class__()
+        for mimetype, options, quality in ranges:
+            if quality != 1:
+                options = dict(options, q=quality)
+            result.append(MediaRange(mimetype, **options))
+        return result
+
+    def intersect(self, other):
+        """Return a new instance with media-ranges accepted by self and other
+
+        Each overlapping pair of media-ranges gives its most specific
+        media-range, and its quality is the product of the quality self and
+        other give to it. Media-ranges with a null quality are dropped, unless
+        a kept wildcard covers them: they are then kept with ``q=0``, so the
+        result still refuses them:
+
+            >>> left = HeaderAccept([MediaRange('text/*'), MediaRange('*/*', q='0.5')])
+            >>> right = HeaderAccept([MediaRange('text/html'), MediaRange('image/png')])
+            >>> left.intersect(right).to_http()
+            'text/html,image/png;q=0.5'
+
+        """
+        candidates = {}
+        for item in self:
+            for match in other._overlapping(item):
+                # Keep the most specific of both mimetypes
+                if item.mimetype.count('*') >= match.mimetype.count('*'):
+                    mimetype = match.mimetype
+                else:
+                    mimetype = item.mimetype
+                options = dict(item.options, **match.options)
+                candidates.setdefault(
+                    _range_key(mimetype, options), (mimetype, options)
+                )
+
+        ranges = []
+        refused = []
+        for mimetype, options in candidates.values():
+            quality = (
+                (self._quality_of(mimetype, options) or D(0))
+                * (other._quality_of(mimetype, options) or D(0))
+            ).quantize(D('0.001'))
+            if quality > 0:
+                ranges.append((mimetype, options, quality))
+            else:
+                refused.append((mimetype, options, D(0)))
+
+        kept = self._from_ranges(ranges)
+        ranges.extend(
+            item
+            for item in refused
+            if kept._quality_of(item[0], item[1])
+        )
+
+        return self._from_ranges(ranges)
+
+    def union(self, other):
+        """Return a new instance with media-ranges accepted by self or other
+
+        Each media-range gets the highest quality self or other gives to it:
+
+            >>> left = HeaderAccept([MediaRange('text/html', q='0.5')])
+            >>> right = HeaderAccept([MediaRange('text/*')])
+            >>> left.union(right).to_http()
+            'text/html,text/*'
+
+        """
+        candidates = {}
+        for item in list(self) + list(other):
+            candidates.setdefault(
+                _range_key(item.mimetype, item.options),
+                (item.mimetype, item.options)
+            )
+
+        ranges = []
+        for mimetype, options in candidates.values():
+            quality = max(
+                self._quality_of(mimetype, options) or D(0),
+                other._quality_of(mimetype, options) or D(0),
+            )
+            ranges.append((mimetype, options, quality))
+
+        return self._from_ranges(ranges)
+
+    def difference(self, other):
+        """Return a new instance with media-ranges accepted by self only
+
+        Self's media-ranges accepted by other are removed. Other's
+        media-ranges still covered by a remaining wildcard are excluded
+        with ``q=0``, and media-ranges other refuses with ``q=0`` are added
+        with the quality self gives to them:
+
+            >>> left = HeaderAccept([MediaRange('text/*')])
+            >>> right = HeaderAccept([MediaRange('text/html')])
+            >>> left.difference(right).to_http()
+            'text/*,text/html;q=0.0'
+
+        """
+        kept = self.__class__(
+            item
+            for item in self
+            if not other._quality_of(item.mimetype, item.options)
+        )
+
+        ranges = [
+            (item.mimetype, item.options, item.quality)
+            for item in kept
+        ]
+        excluded = set(_range_key(*item[:2]) for item in ranges)
+        refused = []
+        for item in other:
+            key = _range_key(item.mimetype, item.options)
+            if not item.quality:
+                refused.append(item)
+            elif key not in excluded \
+                    and kept._quality_of(item.mimetype, item.options):
+                excluded.add(key)
+                ranges.append((item.mimetype, item.options, D(0)))
+
+        # Refused by other, so in the difference unless self refuses it too
+        result = self._from_ranges(ranges)
+        for item in refused:
+            quality = self._quality_of(item.mimetype, item.options)
+            if quality and \
+                    quality != result._quality_of(item.mimetype, item.options):
+                ranges.append((item.mimetype, item.options, quality))
+
+        return self._from_ranges(ranges)
@@ -0,0 +1,372 @@
+"""Content negotiation: variant selection and renderer dispatch"""
+from decimal import Decimal as D
+
+from .mediarange import MediaRange, _split_mimetype
+from .parser import parse_accept_value
+
+
+def _language_ranges(language):
+    """Return the language-ranges matching a language tag, from the most to
+    the least specific one (RFC 2616, section 14.4)."""
+    ranges = [language]
+    while '-' in language:
+        language = language.rsplit('-', 1)[0]
+        ranges.append(language)
+    ranges.append('*')
+    return ranges
+
+
+def _token_quality(accept, tokens):
+    """Return the quality of the first of tokens found in accept, or None."""
+    by_token = accept._get_index()[0]
+    for token in tokens:
+        items = by_token.get(token)
+        if items:
+            return items[0].quality
+    return None
+
+
+class VariantTable(object):
+    """Table of the variants of a resource, to select the best one
+
+    Each variant has a value (anything: a filename, a renderer, etc.), a
+    mimetype and optionally a language, an encoding and a charset, and a
+    source quality, as with Apache ``mod_negotiation`` type maps. The best
+    variant is the one with the highest score, the product of its source
+    quality and of the quality each Accept header gives to it:
+
+        >>> from http_accept import HeaderAccept
+        >>> table = VariantTable()
+        >>> table.add('index.html.en', 'text/html', language='en')
+        >>> table.add('index.html.fr', 'text/html', language='fr')
+        >>> table.add('index.txt', 'text/plain', quality='0.5')
+        >>> accept = HeaderAccept([MediaRange('text/*')])
+        >>> accept_language = HeaderAccept([
+        ...     MediaRange('fr'), MediaRange('en', q='0.8')
+        ... ])
+        >>> table.select(accept, accept_language)
+        'index.html.fr'
+
+    The Accept-Language, Accept-Encoding and Accept-Charset headers are given
+    as ``HeaderAccept`` instances too, each token being a ``mimetype``. A
+    missing header (``None``), or a missing variant's dimension, accepts
+    anything with quality 1.
+
+    Variants are indexed by the distinct values of each dimension, so each
+    value is looked up in the headers only once per selection. They are
+    scored by decreasing source quality: a variant is skipped as soon as a
+    dimension rules it out, and the selection stops as soon as no remaining
+    variant can beat the best score.
+
+    """
+    def __init__(self):
+        """Build an empty table."""
+        self._variants = []
+        # For each dimension, the variants' distinct values with their
+        # parsed form: (mimetype, options) for types, lookup tokens otherwise
+        self._dimensions = ({}, {}, {}, {})
+        self._order = None
+
+    def __len__(self):
+        """Return the number of variants."""
+        return len(self._variants)
+
+    def add(self, value, mimetype, language=None, encoding=None,
+            charset=None, quality=1):
+        """Add a variant to the table.
+
+        The ``mimetype`` may have parameters, as in ``text/html;level=1``.
+        The ``quality`` is the source quality of the variant, from 0 to 1.
+
+        """
+        types, languages, encodings, charsets = self._dimensions
+
+        info = parse_accept_value(mimetype)
+        info['options'].pop('q', None)
+        type_key = MediaRange(info['mimetype'], **info['options']).to_http()
+        types.setdefault(type_key, (info['mimetype'], info['options']))
+
+        keys = [type_key]
+        for index, token in (
+            (languages, language), (encodings, encoding), (charsets, charset)
+        ):
+            if token is not None:
+                token = token.lower()
+                if index is languages:
+                    index.setdefault(token, _language_ranges(token))
+                else:
+                    index.setdefault(token, [token, '*'])
+            keys.append(token)
+
+        self._variants.append((value, D(quality), tuple(keys)))
+        self._order = None
+
+    def _get_order(self):
+        """Return the (cached) variants sorted by decreasing source quality.
+
+        Python's sort is stable, so variants of the same source quality are
+        kept in the order they were added.
+
+        """
+        if self._order is None:
+            self._order = sorted(
+                self._variants, key=lambda variant: variant[1], reverse=True
+            )
+        return self._order
+
+    def select(self, accept=None, accept_language=None,
+               accept_encoding=None, accept_charset=None):
+        """Return the value of the best variant, or None if none is acceptable.
+
+        Each header is a ``HeaderAccept`` instance, or None when the request
+        does not have it.
+
+        """
+        types, languages, encodings, charsets = self._dimensions
+        qualities = []
+
+        if accept is None:
+            qualities.append(dict.fromkeys(types, D(1)))
+        else:
+            qualities.append({
+                key: accept._quality_of(mimetype, options) or D(0)
+                for key, (mimetype, options) in types.items()
+            })
+
+        for header, index in (
+            (accept_language, languages),
+            (accept_encoding, encodings),
+            (accept_charset, charsets),
+        ):
+            dimension = {None: D(1)}
+            for key, tokens in index.items():
+                if header is None:
+                    dimension[key] = D(1)
+                elif index is charsets and key == 'iso-8859-1':
+                    # RFC 2616, section 14.2: ISO-8859-1 is acceptable
+                    # unless explicitly mentioned otherwise
+                    quality = _token_quality(header, tokens)
+                    dimension[key] = D(1) if quality is None else quality
+                else:
+                    dimension[key] = _token_quality(header, tokens) or D(0)
+            qualities.append(dimension)
+
+        best = None
+        best_score = D(0)
+        for value, source_quality, keys in self._get_order():
+            if source_quality <= best_score:
+                # Header qualities are at most 1: no variant can do better
+                break
+
+            score = source_quality
+            for dimension, key in zip(qualities, keys):
+                score *= dimension[key]
+                if not score:
+                    break
+
+            if score > best_score:
+                best = value
+                best_score = score
+
+        return best
+
+
+class NotAcceptable(ValueError):
+    """No renderer can produce a media-range accepted by the client."""
+
+
+class RendererRegistry(object):
+    """Registry of renderers, to call the best one for an Accept header
+
+    Renderers are registered for a mimetype (``application/json``), a
+    wildcard (``text/*`` or ``*/*``), or a structured syntax suffix
+    (``*/*+json`` or ``application/*+json``):
+
+        >>> registry = RendererRegistry()
+        >>> @registry.renders('application/json', '*/*+json')
+        ... def render_json(data):
+        ...     return '{"data": "%s"}' % data
+        >>> @registry.renders('text/html')
+        ... def render_html(data):
+        ...     return '<p>%s</p>' % data
+        >>> from http_accept import parse_accept_header
+        >>> accept = parse_accept_header('application/vnd.api+json, */*;q=0.1')
+        >>> registry.render(accept, 'hello')
+        ('application/vnd.api+json', '{"data": "hello"}')
+
+    The best renderer is the one whose mimetype has the highest quality for
+    the client. On a tie, an exact mimetype wins over a suffix, which wins
+    over a wildcard; then the first registered renderer wins.
+
+    Registrations are compiled into lookup tables by type, subtype and suffix
+    on first use, and the decision for a given Accept header is cached.
+    The cache is emptied once it holds ``cache_size`` decisions.
+
+    """
+    # Precedence of each kind of registration on a tie, lowest first
+    _EXACT, _TYPE_SUFFIX, _SUFFIX, _TYPE, _ANY = range(5)
+
+    def __init__(self, cache_size=1024):
+        """Build an empty registry."""
+        self.cache_size = cache_size
+        self._registrations = {}
+        self._lookup = None
+        self._cache = {}
+
+    def register(self, mimetype, renderer):
+        """Register renderer for a mimetype, a wildcard or a suffix.
+
+        Registering a renderer again for the same mimetype replaces the
+        previous one.
+
+        """
+        mimetype = mimetype.lower()
+        main_type, sub_type = _split_mimetype(mimetype)
+        if not main_type or not sub_type:
+            raise ValueError('invalid mimetype \'%s\'' % mimetype)
+
+        if sub_type.startswith('*+'):
+            kind = self._SUFFIX if main_type == '*' else self._TYPE_SUFFIX
+        elif sub_type == '*':
+            kind = self._ANY if main_type == '*' else self._TYPE
+        elif '*' in mimetype:
+            raise ValueError('invalid mimetype \'%s\'' % mimetype)
+        else:
+            kind = self._EXACT
+
+        order = self._registrations.get(
+            mimetype, (None, len(self._registrations))
+        )[1]
+        self._registrations[mimetype] = (renderer, order, kind)
+        self._lookup = None
+        self._cache.clear()
+
+    def renders(self, *mimetypes):
+        """Return a decorator to register a renderer for mimetypes."""
+        def decorator(renderer):
+            for mimetype in mimetypes:
+                self.register(mimetype, renderer)
+            return renderer
+        return decorator
+
+    def _get_lookup(self):
+        """Return the (cached) lookup tables of registrations.
+
+        The tables are: registrations by mimetype, concrete registrations by
+        main type, and registrations by suffix. Each registration is a
+        ``(mimetype, renderer, rank)`` tuple, where the rank sorts
+        registrations on a tie.
+
+        """
+        if self._lookup is None:
+            by_mimetype = {}
+            by_type = {}
+            by_suffix = {}
+            for mimetype, registered in self._registrations.items():
+                renderer, order, kind = registered
+                registration = (mimetype, renderer, (kind, order))
+                main_type, sub_type = _split_mimetype(mimetype)
+                by_mimetype[mimetype] = registration
+                if kind == self._EXACT:
+                    by_type.setdefault(main_type, []).append(registration)
+                if kind in (self._SUFFIX, self._TYPE_SUFFIX):
+                    by_suffix.setdefault(sub_type[1:], []).append(registration)
+            self._lookup = (by_mimetype, by_type, by_suffix)
+        return self._lookup
+
+    def _candidates(self, item):
+        """Yield the ``(mimetype, renderer, rank)`` registrations matching a
+        client's media-range, with the concrete mimetype to render.
+
+        A client's wildcard only matches registered concrete mimetypes: a
+        wildcard or suffix registration can not tell which mimetype to render
+        for it.
+
+        """
+        by_mimetype, by_type, by_suffix = self._get_lookup()
+        main_type, sub_type = _split_mimetype(item.mimetype)
+
+        if main_type == '*':
+            registrations = [
+                registration
+                for registrations in by_type.values()
+                for registration in registrations
+            ]
+        elif sub_type == '*':
+            registrations = by_type.get(main_type, [])
+        else:
+            # A concrete mimetype: render it with any matching registration
+            _, plus, suffix = sub_type.rpartition('+')
+            for mimetype in (
+                item.mimetype, '%s/*' % main_type, '*/*'
+            ):
+                if mimetype in by_mimetype:
+                    yield (item.mimetype,) + by_mimetype[mimetype][1:]
+            if plus:
+                for registration in by_suffix.get('+' + suffix, []):
+                    if registration[0].startswith(('*/', main_type + '/')):
+                        yield (item.mimetype,) + registration[1:]
+            return
+
+        for registration in registrations:
+            yield registration
+
+    def select(self, accept):
+        """Return the ``(mimetype, renderer)`` to use for a HeaderAccept.
+
+        The mimetype is the concrete one to render: the client's mimetype, or
+        the registered one when the client sent a wildcard. Wildcard and
+        suffix renderers are only selected for a concrete mimetype sent by
+        the client, so a client sending only ``*/*`` needs a renderer also
+        registered for a concrete mimetype. Return None if no renderer is
+        acceptable.
+
+        """
+        key = tuple(
+            (item.mimetype, item.quality, frozenset(item.options.items()))
+            for item in accept
+        )
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        best = None
+        best_score = None
+        for item in accept:
+            for mimetype, renderer, rank in self._candidates(item):
+                if mimetype == item.mimetype:
+                    quality = accept._quality_of(mimetype, item.options)
+                else:
+                    quality = accept._quality_of(mimetype, {}) or D(0)
+                score = (quality, tuple(-value for value in rank))
+                if quality > 0 and (best_score is None or score > best_score):
+                    best = (mimetype, renderer)
+                    best_score = score
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[key] = best
+
+        return best
+
+    def render(self, accept, *args, **kwargs):
+        """Call the best renderer for a HeaderAccept with args and kwargs.
+
+        Return a tuple of the rendered mimetype and the renderer's result.
+        Raise NotAcceptable if no renderer is acceptable.
+
+        """
+        selected = self.select(accept)
+        if selected is None:
+            raise NotAcceptable(
+                'no renderer for \'%s\'' % accept.to_http()
+            )
+
+        mimetype, renderer = selected
+        return mimetype, renderer(*args, **kwargs)
+
+
+# Default registry, for ``@renders('application/json')``
+renderers = RendererRegistry()
+renders = renderers.renders
@@ -0,0 +1,230 @@
+"""Parse Accept headers into media-ranges"""
+import re
+
+from .mediarange import FrozenMediaRange, HeaderAccept
+
+
+# Maximum number of shared media-ranges kept by ``parse_media_range``
+MEDIA_RANGE_POOL_SIZE = 1024
+_media_range_pool = {}
+
+# AcceptStats instance recording parsed headers, see ``track_accept_headers``
+_accept_stats = None
+
+# Elements separated by a comma (or a semicolon), a quoted-string being part
+# of an element even if it contains the separator.
+_QUOTED = r'"(?:[^"\\]|\\.)*"?'
+_COMMA_SEPARATED_RE = re.compile(r'(?:[^,"]|%s)+' % _QUOTED)
+_SEMICOLON_SEPARATED_RE = re.compile(r'(?:[^;"]|%s)+' % _QUOTED)
+_QUOTED_PAIR_RE = re.compile(r'\\(.)')
+
+
+def _split_parameters(accept_value):
+    """Return the ``;`` separated parts of an accept value, without
+    surrounding whitespace.
+
+    The first part is the mimetype, kept even if empty; empty parameters are
+    dropped.
+
+    """
+    parts = [
+        value.strip()
+        for value in _SEMICOLON_SEPARATED_RE.findall(accept_value)
+    ]
+    if accept_value.startswith(';'):
+        parts.insert(0, '')
+    return parts[:1] + [part for part in parts[1:] if part]
+
+
+def _unquote(value):
+    """Return the content of a quoted-string, or value if it is a token."""
+    if not value.startswith('"'):
+        return value
+
+    value = value[1:]
+    if value.endswith('"'):
+        value = value[:-1]
+    return _QUOTED_PAIR_RE.sub(r'\1', value)
+
+
+def split_accept_header(accept_header):
+    """Split accept header into accept header value's data and return generator
+
+    One can iterate over the result of this function's call, at it returns
+    a generator - or transform the result into a python list:
+
+        >>> list(split_accept_header('text/html, application/xml;q=0.8'))
+        ['text/html', 'application/xml;q=0.8']
+
+    This function can be used, for example, with ``parse_accept_value``:
+
+        >>> values = split_accept_header('text/html, application/xml;q=0.8')
+        >>> for value in values:
+        ...     print(parse_accept_value(value))
+        ...
+        {'mimetype': 'text/html', 'options': {}}
+        {'mimetype': 'application/xml', 'options': {'q': '0.8'}}
+
+    Whitespace around separators is removed, and empty elements are ignored.
+    Commas, semicolons and spaces inside a quoted-string are kept as-is:
+
+        >>> list(split_accept_header('text/html; profile="a, b" , ,*/*'))
+        ['text/html;profile="a, b"', '*/*']
+
+    See ``parse_accept_value`` for more information.
+
+    """
+    return (
+        ';'.join(
+            '='.join(item.strip() for item in part.split('=', 1))
+            for part in parts
+        )
+        for parts in (
+            _split_parameters(value)
+            for value in _COMMA_SEPARATED_RE.findall(accept_header)
+        )
+        if any(parts)
+    )
+
+
+def parse_accept_value(accept_value):
+    """Split an accept header value into severals key into a dict.
+
+    You can give a value like ``text/html``, or like ``application/xml;q=0.8``,
+    and this function will returns a dict with two keys:
+
+    * ``mimetype``: the parsed mimetype as a string
+    * ``options``: a dict of {key: value} from the ``key=value`` part.
+
+    For example:
+
+        >>> parse_accept_value('text/html')
+        {'mimetype': 'text/html', 'options': {}}
+        >>> parse_accept_value('text/html;q=0.8')
+        {'mimetype': 'text/html', 'options': {'q': '0.8'}}
+        >>> parse_accept_value('text/html;q=0.8;level=1')
+        {'mimetype': 'text/html', 'options': {'q': '0.8', 'level': '1'}}
+
+    The mimetype and the parameter names are case-insensitive, so they are
+    lowercased here, once and for all. Quoted-string values are unquoted:
+
+        >>> parse_accept_value('Text/HTML;Profile="a, \\"b\\""')
+        {'mimetype': 'text/html', 'options': {'profile': 'a, "b"'}}
+
+    A parameter without a value raises a ValueError.
+
+    """
+    if accept_value is None:
+        raise TypeError(
+            'parse_accept_value() argument must be a string, '
+            'not \'%s\'' % type(accept_value)
+        )
+
+    values = _split_parameters(accept_value)
+    mimetype = values.pop(0).lower() if values else ''
+    args = {}
+    for value in values:
+        key, separator, option = value.partition('=')
+        if not separator:
+            raise ValueError(
+                'parse_accept_value() parameter \'%s\' has no value' % value
+            )
+        args[key.strip().lower()] = _unquote(option.strip())
+
+    return {
+        'mimetype': mimetype,
+        'options': args
+    }
+
+
+def _normalize_accept_value(accept_value):
+    """Return an accept value without whitespace around separators, and with
+    its mimetype and parameter names lowercased."""
+    parts = _split_parameters(accept_value)
+    if not parts:
+        return ''
+
+    normalized = [parts[0].lower()]
+    for part in parts[1:]:
+        key, separator, value = part.partition('=')
+        normalized.append(key.strip().lower() + separator + value.strip())
+    return ';'.join(normalized)
+
+
+def parse_media_range(accept_value):
+    """Parse an accept header value and return a shared FrozenMediaRange
+
+    Parsed media-ranges are kept in a pool, keyed by their ``to_http()``
+    text, so equivalent values share the same instance, whatever their case,
+    whitespace, parameter order or quoting:
+
+        >>> parse_media_range('text/html;q=0.8').to_http()
+        'text/html;q=0.8'
+        >>> parse_media_range('*/*') is parse_media_range('*/*')
+        True
+        >>> parse_media_range('Text/HTML; Q=0.8') is parse_media_range(
+        ...     'text/html;q=0.8')
+        True
+        >>> parse_media_range('text/html;p="a"') is parse_media_range(
+        ...     'text/html;p=a')
+        True
+
+    A value already in this form, as most values returned by
+    ``split_accept_header`` are, is found with a single dict lookup without
+    being parsed; a value only differing by case or whitespace is found once
+    normalized. Other values are parsed before looking up the pool.
+
+    Once the pool holds ``MEDIA_RANGE_POOL_SIZE`` media-ranges, it is cleared
+    completely, frequently used media-ranges included, and refilled by the
+    next calls.
+
+    """
+    try:
+        return _media_range_pool[accept_value]
+    except KeyError:
+        pass
+
+    key = _normalize_accept_value(accept_value)
+    try:
+        return _media_range_pool[key]
+    except KeyError:
+        pass
+
+    info = parse_accept_value(key)
+    media_range = FrozenMediaRange(info['mimetype'], **info['options'])
+
+    # Unquoted and with sorted parameters
+    key = media_range.to_http()
+    try:
+        return _media_range_pool[key]
+    except KeyError:
+        pass
+
+    if len(_media_range_pool) >= MEDIA_RANGE_POOL_SIZE:
+        _media_range_pool.clear()
+    _media_range_pool[key] = media_range
+
+    return media_range
+
+
+def parse_accept_header(accept_header):
+    """Parse an Accept header and return a HeaderAccept instance
+
+    This function combines ``split_accept_header`` and ``parse_media_range``:
+
+        >>> accepts = parse_accept_header('text/html, */*;q=0.8')
+        >>> accepts.to_http()
+        'text/html,*/*;q=0.8'
+        >>> accepts.is_html_accepted()
+        True
+
+    When an ``AcceptStats`` instance is installed with
+    ``track_accept_headers``, the header and its values are recorded.
+
+    """
+    values = split_accept_header(accept_header)
+    if _accept_stats is not None:
+        values = list(values)
+        _accept_stats.record(accept_header, values)
+
+    return HeaderAccept(parse_media_range(value) for value in values)
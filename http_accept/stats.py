@@ -0,0 +1,267 @@
+"""Streaming statistics of parsed Accept headers"""
+import threading
+
+from . import parser
+from .negotiation import renderers
+
+
+class SpaceSaving(object):
+    """Space-Saving sketch of the most frequent items of a stream
+
+    The sketch keeps at most ``capacity`` items with their approximate count.
+    When a new item comes in and the sketch is full, it replaces the item with
+    the lowest count and inherits its count, which is remembered as the
+    item's maximum error (Metwally, Agrawal and El Abbadi, 2005):
+
+        >>> sketch = SpaceSaving(capacity=2)
+        >>> for item in ['a', 'b', 'a', 'c', 'a']:
+        ...     sketch.add(item)
+        >>> sketch.top(1)
+        [('a', 3, 0)]
+
+    Any item seen more than ``total / capacity`` times is in the sketch, and
+    its count is at most overestimated by its error.
+
+    Items are grouped in buckets by count, and buckets are linked in
+    increasing count order (the Stream-Summary structure of the paper), so
+    counting an item once does not walk the sketch. Counting it more than once
+    at a time only walks the buckets between its old and its new count.
+
+    """
+    def __init__(self, capacity=100):
+        """Build an empty sketch of a given capacity."""
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1, not %r' % capacity)
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        # Buckets of items by count, linked with the previous and next count
+        self._buckets = {}
+        self._previous = {}
+        self._next = {}
+        self._minimum = None
+
+    def __len__(self):
+        """Return the number of items in the sketch."""
+        return len(self._counts)
+
+    def _link(self, count, start):
+        """Return the bucket of count, linking a new one if needed.
+
+        The bucket's place is searched from the bucket of ``start``, a lower
+        count, or from the lowest count if ``start`` is None.
+
+        """
+        bucket = self._buckets.get(count)
+        if bucket is not None:
+            return bucket
+
+        previous = start
+        following = self._minimum if start is None else self._next[start]
+        while following is not None and following < count:
+            previous, following = following, self._next[following]
+
+        bucket = self._buckets[count] = set()
+        self._previous[count] = previous
+        self._next[count] = following
+        if previous is None:
+            self._minimum = count
+        else:
+            self._next[previous] = count
+        if following is not None:
+            self._previous[following] = count
+
+        return bucket
+
+    def _unlink(self, count):
+        """Remove the bucket of count if it is empty."""
+        if self._buckets[count]:
+            return
+
+        del self._buckets[count]
+        previous = self._previous.pop(count)
+        following = self._next.pop(count)
+        if previous is None:
+            self._minimum = following
+        else:
+            self._next[previous] = following
+        if following is not None:
+            self._previous[following] = previous
+
+    def add(self, item, count=1):
+        """Count item ``count`` more times."""
+        if count < 1:
+            raise ValueError('count must be at least 1, not %r' % count)
+        self.total += count
+
+        old_count = self._counts.get(item)
+        if old_count is not None:
+            new_count = old_count + count
+            self._link(new_count, old_count).add(item)
+            self._counts[item] = new_count
+            self._buckets[old_count].discard(item)
+            self._unlink(old_count)
+            return
+
+        error = 0
+        start = None
+        if len(self._counts) >= self.capacity:
+            error = start = self._minimum
+            evicted = self._buckets[error].pop()
+            del self._counts[evicted]
+            del self._errors[evicted]
+
+        self._link(error + count, start).add(item)
+        self._counts[item] = error + count
+        self._errors[item] = error
+        if start is not None:
+            self._unlink(start)
+
+    def top(self, k=None):
+        """Return the ``k`` most frequent ``(item, count, error)`` tuples.
+
+        The ``count`` is an upper bound of the item's actual count, and
+        ``count - error`` a lower bound.
+
+        """
+        items = sorted(
+            self._counts.items(), key=lambda item: item[1], reverse=True
+        )
+        return [
+            (item, count, self._errors[item])
+            for item, count in items[:k]
+        ]
+
+    def suggested_size(self, coverage=0.95):
+        """Return how many of the most frequent items cover a stream's share.
+
+        Only guaranteed counts (``count - error``) are used. Return 0 for an
+        empty stream, and None if the items in the sketch are not enough to
+        cover ``coverage`` of the stream.
+
+        """
+        if not self.total:
+            return 0
+
+        needed = self.total * coverage
+        covered = 0
+        for size, (_, count, error) in enumerate(self.top(), 1):
+            covered += count - error
+            if covered >= needed:
+                return size
+        return None
+
+
+class AcceptStats(object):
+    """Track the most frequent Accept headers, media-ranges and media types
+
+    Once installed with ``track_accept_headers``, each header parsed by
+    ``parse_accept_header`` is recorded in three ``SpaceSaving`` sketches:
+    one for the raw headers, one for their media-ranges (as returned by
+    ``split_accept_header``), and one for their lowercased media types, so
+    memory is bounded by ``capacity``:
+
+        >>> from http_accept import parse_accept_header
+        >>> stats = AcceptStats(capacity=10)
+        >>> track_accept_headers(stats)
+        >>> accepts = parse_accept_header('text/html, */*;q=0.8')
+        >>> track_accept_headers(None)
+        >>> stats.snapshot()['media_ranges']
+        [('text/html', 1, 0), ('*/*;q=0.8', 1, 0)]
+        >>> stats.snapshot()['media_types']
+        [('text/html', 1, 0), ('*/*', 1, 0)]
+
+    The sketches tell how many distinct headers and media-ranges make most
+    of the traffic, which sizes the caches: ``resize_caches`` sets
+    ``MEDIA_RANGE_POOL_SIZE`` and the registries' ``cache_size``. With
+    ``resize_every``, this is done automatically every ``resize_every``
+    recorded headers.
+
+    """
+    def __init__(self, capacity=1000, resize_every=None, coverage=0.95,
+                 registries=None):
+        """Build empty statistics.
+
+        The ``registries`` resized with ``resize_caches`` default to the
+        default registry, ``renderers``.
+
+        """
+        self.headers = SpaceSaving(capacity)
+        self.media_ranges = SpaceSaving(capacity)
+        self.media_types = SpaceSaving(capacity)
+        self.resize_every = resize_every
+        self.coverage = coverage
+        self.registries = [renderers] if registries is None else registries
+        self._lock = threading.Lock()
+
+    def record(self, accept_header, values):
+        """Record an Accept header and its values."""
+        with self._lock:
+            self.headers.add(accept_header)
+            for value in values:
+                self.media_ranges.add(value)
+                self.media_types.add(value.partition(';')[0].strip().lower())
+            resize = (
+                self.resize_every
+                and self.headers.total % self.resize_every == 0
+            )
+
+        if resize:
+            self.resize_caches()
+
+    def snapshot(self, top=None):
+        """Return a dict of the ``top`` most frequent headers, media-ranges
+        and media types.
+
+        The dict has the ``total`` number of headers recorded, and the
+        ``headers``, ``media_ranges`` and ``media_types`` lists of
+        ``(item, count, error)`` tuples (see ``SpaceSaving.top``).
+
+        """
+        with self._lock:
+            return {
+                'total': self.headers.total,
+                'headers': self.headers.top(top),
+                'media_ranges': self.media_ranges.top(top),
+                'media_types': self.media_types.top(top),
+            }
+
+    def resize_caches(self, minimum=64, maximum=65536):
+        """Resize the caches to hold the most frequent items, and return the
+        new ``(media_range_pool_size, registry_cache_size)``.
+
+        Each cache is sized to twice the number of items covering
+        ``coverage`` of the traffic, within ``[minimum, maximum]``. If the
+        sketch can not tell, the cache size is doubled. A cache is left
+        unchanged while nothing has been recorded in its sketch.
+
+        """
+        with self._lock:
+            media_range_size = self.media_ranges.suggested_size(self.coverage)
+            header_size = self.headers.suggested_size(self.coverage)
+
+        def new_size(suggested, current):
+            if suggested == 0:
+                return current
+            size = current * 2 if suggested is None else suggested * 2
+            return max(minimum, min(maximum, size))
+
+        parser.MEDIA_RANGE_POOL_SIZE = new_size(
+            media_range_size, parser.MEDIA_RANGE_POOL_SIZE
+        )
+        registry_size = None
+        for registry in self.registries:
+            registry.cache_size = new_size(header_size, registry.cache_size)
+            registry_size = registry.cache_size
+
+        return parser.MEDIA_RANGE_POOL_SIZE, registry_size
+
+
+def track_accept_headers(stats):
+    """Record headers parsed by ``parse_accept_header`` into stats.
+
+    ``stats`` is an ``AcceptStats`` instance, or None to stop recording.
+
+    """
+    parser._accept_stats = stats
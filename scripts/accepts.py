@@ -1,31 +1,221 @@
-#!/bin/python
-from __future__ import print_function, unicode_literals
+"""Show statistics about Accept HTTP Headers
 
+Read one Accept header per line, from stdin or from log files, and print
+aggregates: top headers, top media types, quality distribution, share of
+clients accepting HTML, and malformed headers count.
+
+Log files are memory-mapped and split into chunks counted in parallel by a
+pool of processes. Identical headers are counted once and parsed once, so
+only distinct headers go through ``http_accept``.
+
+With ``--pattern``, the header is extracted from each line with the first
+group of a regular expression (lines that do not match are ignored)::
+
+    $ python scripts/accepts.py --pattern '"accept": "([^"]*)"' access.log
+
+The script needs Python 3. It imports ``http_accept`` from the checkout it
+belongs to, so it runs from a checkout without installing the package.
+
+"""
+import mmap
+import os
+import re
+import sys
 from argparse import ArgumentParser
+from collections import Counter
+from decimal import InvalidOperation
+from multiprocessing import Pool
 
-from http_accept import parse_accept_value, split_accept_header
-from http_accept import HeaderAcceptList, HeaderAcceptValue
+# Import the package of this checkout, not an installed one
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
 
+from http_accept import parse_accept_header  # IGNORE:C0413
 
-if __name__ == '__main__':
+
+CHUNK_SIZE = 32 * 1024 * 1024
+PARSE_CHUNK_SIZE = 512
+ENCODING = 'latin-1'
+
+
+def extract_header(line, pattern=None):
+    """Return the Accept header of a line, or None if there is none."""
+    line = line.decode(ENCODING).strip()
+    if pattern is not None:
+        match = pattern.search(line)
+        if match is None:
+            return None
+        line = match.group(1).strip()
+    return line or None
+
+
+def count_lines(lines, pattern=None):
+    """Return a Counter of the Accept headers found in lines."""
+    counter = Counter()
+    for line in lines:
+        header = extract_header(line, pattern)
+        if header is not None:
+            counter[header] += 1
+    return counter
+
+
+def split_file(path, jobs):
+    """Return a list of ``(path, start, end)`` chunks of a file."""
+    size = os.path.getsize(path)
+    step = max(min(CHUNK_SIZE, size // jobs), 1)
+    return [
+        (path, start, min(start + step, size))
+        for start in range(0, size, step)
+    ]
+
+
+def iter_chunk_lines(mapped, start, end):
+    """Yield the lines starting in ``[start, end)`` of a mapped file.
+
+    A line starting before ``start`` belongs to the previous chunk, even if
+    it ends inside this one.
+
+    """
+    end = min(end, len(mapped))
+    if start > 0:
+        position = mapped.find(b'\n', start - 1)
+        start = len(mapped) if position == -1 else position + 1
+
+    while start < end:
+        position = mapped.find(b'\n', start)
+        if position == -1:
+            position = len(mapped)
+        yield mapped[start:position]
+        start = position + 1
+
+
+def count_chunk(task):
+    """Return a Counter of the Accept headers of a file's chunk."""
+    path, start, end, pattern = task
+    if pattern is not None:
+        pattern = re.compile(pattern)
+
+    with open(path, 'rb') as log_file:
+        mapped = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return count_lines(iter_chunk_lines(mapped, start, end), pattern)
+        finally:
+            mapped.close()
+
+
+def parse_header(header):
+    """Parse an Accept header and return what the statistics need.
+
+    Return a ``(header, info)`` tuple, where ``info`` is None if the header is
+    malformed, or a tuple of the list of ``(mimetype, quality)`` and the
+    result of ``is_html_accepted``. Qualities are normalized strings, so
+    ``q=1.0``, ``q=1`` and no ``q`` all give ``'1'``.
+
+    """
+    try:
+        accepts = parse_accept_header(header)
+    except (ValueError, TypeError, InvalidOperation):
+        return header, None
+
+    if not accepts or any('/' not in item.mimetype for item in accepts):
+        return header, None
+
+    return header, (
+        [(item.mimetype, str(item.quality.normalize())) for item in accepts],
+        accepts.is_html_accepted()
+    )
+
+
+def collect(headers, pool):
+    """Parse distinct headers in the pool and return the statistics."""
+    media_types = Counter()
+    qualities = Counter()
+    html = 0
+    malformed = 0
+
+    results = pool.imap_unordered(
+        parse_header, headers.keys(), chunksize=PARSE_CHUNK_SIZE
+    )
+    for header, info in results:
+        count = headers[header]
+        if info is None:
+            malformed += count
+            continue
+
+        ranges, is_html = info
+        for mimetype, quality in ranges:
+            media_types[mimetype] += count
+            qualities[quality] += count
+        if is_html:
+            html += count
+
+    return media_types, qualities, html, malformed
+
+
+def print_counter(title, counter, total, top=None):
+    """Print the ``top`` most common items of a counter."""
+    print(title)
+    for value, count in counter.most_common(top):
+        print('  %10d  %6.2f%%  %s' % (count, 100.0 * count / total, value))
+    print()
+
+
+def main(argv=None):
     parser = ArgumentParser(
-        description='Show info of an Accept HTTP Header'
+        description='Show statistics about Accept HTTP Headers'
+    )
+    parser.add_argument(
+        'files', nargs='*', metavar='FILE',
+        help='log files to read (default: read stdin)'
+    )
+    parser.add_argument(
+        '-p', '--pattern',
+        help='regular expression extracting the header as its first group'
     )
-    parser.add_argument('header')
-    arguments = parser.parse_args()
-
-    accepts = HeaderAcceptList(
-        HeaderAcceptValue(
-            info.get('mimetype'), **info.get('options', {})
-        )
-        for info in (
-        parse_accept_value(value)
-        for value in split_accept_header(arguments.header)
-    ))
-
-    for accept in accepts:
-        print(
-            '%s %s %s' % (accept.mimetype, accept.quality, ';'.join(
-                '='.join((key, value)) for key, value in accept.options.items()
-            ))
-        )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='number of processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '-n', '--top', type=int, default=10,
+        help='number of top headers and media types to show (default: 10)'
+    )
+    arguments = parser.parse_args(argv)
+
+    with Pool(arguments.jobs) as pool:
+        if arguments.files:
+            tasks = [
+                chunk + (arguments.pattern,)
+                for path in arguments.files
+                for chunk in split_file(path, arguments.jobs)
+            ]
+            headers = Counter()
+            for counter in pool.imap_unordered(count_chunk, tasks):
+                headers.update(counter)
+        else:
+            pattern = arguments.pattern
+            headers = count_lines(
+                getattr(sys.stdin, 'buffer', sys.stdin),
+                re.compile(pattern) if pattern is not None else None
+            )
+
+        total = sum(headers.values())
+        if not total:
+            print('No Accept header found.')
+            return 1
+
+        media_types, qualities, html, malformed = collect(headers, pool)
+
+    print('Headers: %d (%d distinct)' % (total, len(headers)))
+    print('HTML accepted: %d (%.2f%%)' % (html, 100.0 * html / total))
+    print('Malformed: %d (%.2f%%)' % (malformed, 100.0 * malformed / total))
+    print()
+    print_counter('Top headers:', headers, total, arguments.top)
+    print_counter('Top media types:', media_types, total, arguments.top)
+    print_counter('Quality distribution:', qualities, sum(qualities.values()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
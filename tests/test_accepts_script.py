@@ -0,0 +1,105 @@
+import os
+import re
+from collections import Counter
+from importlib.util import module_from_spec, spec_from_file_location
+from multiprocessing.dummy import Pool
+
+from pytest import fixture  # IGNORE:E0611
+
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'scripts', 'accepts.py'
+)
+
+
+@fixture
+def accepts():
+    """Return the scripts/accepts.py module"""
+    spec = spec_from_file_location('accepts', SCRIPT_PATH)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_iter_chunk_lines(accepts):
+    """Assert each line is yielded by the chunk where it starts"""
+    content = b'aa\nbbbb\n\ncc\nd'
+
+    assert list(accepts.iter_chunk_lines(content, 0, len(content))) == [
+        b'aa', b'bbbb', b'', b'cc', b'd'
+    ]
+
+    for size in range(1, len(content) + 2):
+        lines = [
+            line
+            for start in range(0, len(content), size)
+            for line in accepts.iter_chunk_lines(content, start, start + size)
+        ]
+        assert lines == [b'aa', b'bbbb', b'', b'cc', b'd'], size
+
+
+def test_iter_chunk_lines_boundaries(accepts):
+    content = b'aa\nbb\ncc\n'
+
+    # A chunk starting right after a newline starts with its line
+    assert list(accepts.iter_chunk_lines(content, 3, 6)) == [b'bb']
+    # A chunk starting inside a line skips it
+    assert list(accepts.iter_chunk_lines(content, 4, 6)) == []
+    # A chunk ending inside a line yields it whole
+    assert list(accepts.iter_chunk_lines(content, 0, 4)) == [b'aa', b'bb']
+    # A chunk ending after the content stops at its end
+    assert list(accepts.iter_chunk_lines(content, 6, 100)) == [b'cc']
+
+
+def test_count_chunk(accepts, tmp_path, monkeypatch):
+    """Assert chunks of a file count every header once"""
+    monkeypatch.setattr(accepts, 'CHUNK_SIZE', 7)
+    path = str(tmp_path / 'access.log')
+    with open(path, 'wb') as log_file:
+        log_file.write(b'text/html\n*/*\n\ntext/html\n*/*;q=0.8')
+
+    counter = Counter()
+    for chunk in accepts.split_file(path, 2):
+        counter.update(accepts.count_chunk(chunk + (None,)))
+
+    assert counter == Counter({'text/html': 2, '*/*': 1, '*/*;q=0.8': 1})
+
+
+def test_count_lines_pattern(accepts):
+    lines = [b'GET / "accept": "text/html"', b'GET /favicon.ico']
+    counter = accepts.count_lines(lines, re.compile(r'"accept": "([^"]*)"'))
+
+    assert counter == Counter({'text/html': 1})
+
+
+def test_parse_header(accepts):
+    header, info = accepts.parse_header('text/html, */*;q=0.50')
+
+    assert header == 'text/html, */*;q=0.50'
+    assert info == ([('text/html', '1'), ('*/*', '0.5')], True)
+
+
+def test_parse_header_malformed(accepts):
+    for header in ('text/html;level', 'text/html;q=high', 'html', ',,'):
+        assert accepts.parse_header(header) == (header, None)
+
+
+def test_collect(accepts):
+    headers = Counter({
+        'text/html;q=1.0, */*;q=0.50': 3,
+        'application/json, */*;q=0.5': 2,
+        'text/html;level': 1,
+    })
+
+    with Pool(2) as pool:
+        media_types, qualities, html, malformed = accepts.collect(
+            headers, pool
+        )
+
+    assert media_types == Counter({
+        '*/*': 5, 'text/html': 3, 'application/json': 2
+    })
+    assert qualities == Counter({'1': 5, '0.5': 5})
+    assert html == 3
+    assert malformed == 1
@@ -0,0 +1,104 @@
+from http_accept import (
+    AcceptStats, RendererRegistry, parse_accept_header, parser,
+    track_accept_headers
+)
+
+
+def test_AcceptStats():
+    stats = AcceptStats(capacity=10)
+    stats.record('text/html,*/*', ['text/html', '*/*'])
+    stats.record('application/json', ['application/json'])
+    stats.record('text/html,*/*', ['text/html', '*/*'])
+    stats.record('Text/HTML;q=0.9', ['Text/HTML;q=0.9'])
+
+    snapshot = stats.snapshot()
+    assert snapshot['total'] == 4
+    assert snapshot['headers'] == [
+        ('text/html,*/*', 2, 0),
+        ('application/json', 1, 0),
+        ('Text/HTML;q=0.9', 1, 0),
+    ]
+    assert snapshot['media_ranges'] == [
+        ('text/html', 2, 0),
+        ('*/*', 2, 0),
+        ('application/json', 1, 0),
+        ('Text/HTML;q=0.9', 1, 0),
+    ]
+    assert snapshot['media_types'] == [
+        ('text/html', 3, 0),
+        ('*/*', 2, 0),
+        ('application/json', 1, 0),
+    ]
+    assert stats.snapshot(top=1)['headers'] == [('text/html,*/*', 2, 0)]
+
+
+def test_track_accept_headers():
+    stats = AcceptStats(capacity=10)
+
+    track_accept_headers(stats)
+    try:
+        parse_accept_header('text/html, */*;q=0.8')
+        parse_accept_header('text/html, */*;q=0.8')
+    finally:
+        track_accept_headers(None)
+    parse_accept_header('application/json')
+
+    snapshot = stats.snapshot()
+    assert snapshot['total'] == 2
+    assert snapshot['headers'] == [('text/html, */*;q=0.8', 2, 0)]
+    assert snapshot['media_ranges'] == [
+        ('text/html', 2, 0),
+        ('*/*;q=0.8', 2, 0),
+    ]
+
+
+def test_AcceptStats_resize_caches(monkeypatch):
+    monkeypatch.setattr(parser, 'MEDIA_RANGE_POOL_SIZE', 1024)
+    registry = RendererRegistry(cache_size=1024)
+    stats = AcceptStats(capacity=1000, registries=[registry])
+
+    for index in range(100):
+        stats.record('header %d' % (index % 50), ['range %d' % (index % 10)])
+
+    assert stats.resize_caches(minimum=1) == (20, 96)
+    assert parser.MEDIA_RANGE_POOL_SIZE == 20
+    assert registry.cache_size == 96
+
+    assert stats.resize_caches(minimum=64) == (64, 96)
+
+
+def test_AcceptStats_resize_caches_unknown(monkeypatch):
+    """Assert caches grow when the sketches are too small to tell"""
+    monkeypatch.setattr(parser, 'MEDIA_RANGE_POOL_SIZE', 100)
+    registry = RendererRegistry(cache_size=100)
+    stats = AcceptStats(capacity=2, registries=[registry])
+
+    for index in range(10):
+        stats.record('header %d' % index, ['range %d' % index])
+
+    assert stats.resize_caches(maximum=150) == (150, 150)
+
+
+def test_AcceptStats_resize_caches_empty(monkeypatch):
+    """Assert caches are left unchanged while nothing has been recorded"""
+    monkeypatch.setattr(parser, 'MEDIA_RANGE_POOL_SIZE', 100)
+    registry = RendererRegistry(cache_size=100)
+    stats = AcceptStats(registries=[registry])
+
+    assert stats.resize_caches() == (100, 100)
+    assert parser.MEDIA_RANGE_POOL_SIZE == 100
+    assert registry.cache_size == 100
+
+
+def test_AcceptStats_resize_every(monkeypatch):
+    monkeypatch.setattr(parser, 'MEDIA_RANGE_POOL_SIZE', 1024)
+    registry = RendererRegistry(cache_size=1024)
+    stats = AcceptStats(resize_every=10, registries=[registry])
+
+    for index in range(9):
+        stats.record('text/html', ['text/html'])
+    assert registry.cache_size == 1024
+
+    stats.record('text/html', ['text/html'])
+    assert registry.cache_size == 64
+    assert parser.MEDIA_RANGE_POOL_SIZE == 64
@@ -0,0 +1,15 @@
+import doctest
+
+from pytest import mark  # IGNORE:E0611
+
+from http_accept import mediarange, parser
+from http_accept import negotiation, stats
+
+
+@mark.parametrize('module', [mediarange, parser, negotiation, stats])
+def test_doctest(module):
+    """Assert the docstring examples of each module run as shown"""
+    result = doctest.testmod(module)
+
+    assert result.attempted > 0
+    assert result.failed == 0
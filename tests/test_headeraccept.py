@@ -132,3 +132,294 @@ def test_HeaderAccept_is_html_accepted_wildcard():
     ])
     assert accepts.is_html_accepted(strict=True) is False
     assert accepts.is_html_accepted() is True
+
+
+def test_HeaderAccept_empty():
+    accepts = HeaderAccept()
+
+    assert accepts.max_quality == Decimal('0')
+    assert len(accepts) == 0
+    assert accepts.to_http() == ''
+
+
+def test_HeaderAccept_intersect():
+    accepts = HeaderAccept([
+        MediaRange('text/html'),
+        MediaRange('text/*', q='0.8'),
+        MediaRange('*/*', q='0.1'),
+    ])
+    upstream = HeaderAccept([
+        MediaRange('text/html', q='0.5'),
+        MediaRange('text/plain'),
+        MediaRange('application/json'),
+    ])
+
+    result = accepts.intersect(upstream)
+
+    assert isinstance(result, HeaderAccept)
+    assert ('text/html', '0.5') in result
+    assert ('text/plain', '0.8') in result
+    assert ('application/json', '0.1') in result
+    assert len(result) == 3
+    assert result.max_quality == Decimal('0.8')
+
+
+def test_HeaderAccept_intersect_precedence():
+    """Assert the most specific media-range gives the quality"""
+    accepts = HeaderAccept([
+        MediaRange('text/html', q='0.2'),
+        MediaRange('*/*'),
+    ])
+    upstream = HeaderAccept([MediaRange('text/html')])
+
+    result = accepts.intersect(upstream)
+
+    assert list(result) == [MediaRange('text/html', q='0.2')]
+
+
+def test_HeaderAccept_intersect_wildcards():
+    accepts = HeaderAccept([MediaRange('text/*', q='0.5')])
+    upstream = HeaderAccept([MediaRange('*/*', q='0.5')])
+
+    result = accepts.intersect(upstream)
+
+    assert list(result) == [MediaRange('text/*', q='0.25')]
+
+
+def test_HeaderAccept_intersect_options():
+    accepts = HeaderAccept([MediaRange('text/html', level='1')])
+
+    result = accepts.intersect(HeaderAccept([MediaRange('text/html')]))
+    assert list(result) == [MediaRange('text/html', level='1')]
+
+    result = accepts.intersect(
+        HeaderAccept([MediaRange('text/html', level='2')])
+    )
+    assert len(result) == 0
+
+
+def test_HeaderAccept_intersect_refused():
+    """Assert media-ranges with q=0 are not in the intersection"""
+    accepts = HeaderAccept([
+        MediaRange('text/html', q='0'),
+        MediaRange('*/*'),
+    ])
+    upstream = HeaderAccept([
+        MediaRange('text/html'),
+        MediaRange('image/png'),
+    ])
+
+    result = accepts.intersect(upstream)
+
+    assert list(result) == [MediaRange('image/png')]
+
+
+def test_HeaderAccept_union():
+    accepts = HeaderAccept([
+        MediaRange('text/html', q='0.5'),
+        MediaRange('image/png', q='0.8'),
+    ])
+    other = HeaderAccept([
+        MediaRange('text/*'),
+        MediaRange('image/png', q='0.3'),
+    ])
+
+    result = accepts.union(other)
+
+    assert isinstance(result, HeaderAccept)
+    assert ('text/html', '1.0') in result
+    assert ('image/png', '0.8') in result
+    assert ('text/*', '1.0') in result
+    assert len(result) == 3
+    assert result.max_quality == Decimal('1.0')
+
+
+def test_HeaderAccept_difference():
+    accepts = HeaderAccept([
+        MediaRange('text/html'),
+        MediaRange('application/json', q='0.9'),
+    ])
+    other = HeaderAccept([MediaRange('text/*')])
+
+    result = accepts.difference(other)
+
+    assert isinstance(result, HeaderAccept)
+    assert list(result) == [MediaRange('application/json', q='0.9')]
+
+
+def test_HeaderAccept_difference_wildcard():
+    """Assert other's media-ranges are excluded from self's wildcards"""
+    accepts = HeaderAccept([MediaRange('*/*', q='0.5')])
+    other = HeaderAccept([
+        MediaRange('text/html'),
+        MediaRange('image/png', q='0'),
+    ])
+
+    result = accepts.difference(other)
+
+    assert list(result) == [
+        MediaRange('*/*', q='0.5'),
+        MediaRange('text/html', q='0'),
+    ]
+    assert result.to_http() == '*/*;q=0.5,text/html;q=0.0'
+
+
+def test_HeaderAccept_accepts():
+    accepts = HeaderAccept([
+        MediaRange('text/html', level='1'),
+        MediaRange('text/*', q='0.5'),
+        MediaRange('*/*', q='0.1'),
+        MediaRange('image/png', q='0'),
+    ])
+
+    assert accepts.accepts('text/html;level=1') == Decimal('1')
+    assert accepts.accepts('Text/HTML; level=1; charset=utf-8') == Decimal('1')
+    assert accepts.accepts('text/html;level=2') == Decimal('0.5')
+    assert accepts.accepts('text/plain') == Decimal('0.5')
+    assert accepts.accepts('application/json') == Decimal('0.1')
+    assert accepts.accepts('image/png') == Decimal('0')
+
+
+def test_HeaderAccept_accepts_append():
+    accepts = HeaderAccept([MediaRange('text/html')])
+
+    assert accepts.accepts('application/json') == Decimal('0')
+
+    accepts.append(MediaRange('application/json', q='0.8'))
+    assert accepts.accepts('application/json') == Decimal('0.8')
+
+
+def test_HeaderAccept_list_updates():
+    """Assert list updates are seen by set operations and max_quality"""
+    accepts = HeaderAccept([MediaRange('text/html', q='0.5')])
+    accepts.intersect(HeaderAccept([MediaRange('text/html')]))
+
+    accepts.insert(0, MediaRange('image/png', q='0.8'))
+    result = accepts.intersect(HeaderAccept([MediaRange('image/png')]))
+    assert list(result) == [MediaRange('image/png', q='0.8')]
+    assert accepts.max_quality == Decimal('0.8')
+
+    accepts.extend([MediaRange('application/json')])
+    result = accepts.intersect(HeaderAccept([MediaRange('application/json')]))
+    assert list(result) == [MediaRange('application/json')]
+    assert accepts.max_quality == Decimal('1')
+
+    accepts[2] = MediaRange('application/xml', q='0.9')
+    result = accepts.intersect(HeaderAccept([MediaRange('application/*')]))
+    assert list(result) == [MediaRange('application/xml', q='0.9')]
+    assert accepts.max_quality == Decimal('0.9')
+
+    accepts.pop(0)
+    del accepts[0]
+    assert len(accepts.intersect(HeaderAccept([MediaRange('*/*')]))) == 1
+    assert accepts.max_quality == Decimal('0.9')
+
+    accepts += [MediaRange('text/plain')]
+    assert ('text/plain', '1') in accepts.intersect(
+        HeaderAccept([MediaRange('text/*')])
+    )
+    assert accepts.max_quality == Decimal('1')
+
+    accepts.clear()
+    assert len(accepts.intersect(HeaderAccept([MediaRange('*/*')]))) == 0
+    assert accepts.max_quality == Decimal('0')
+
+
+def test_HeaderAccept_accepts_list_updates():
+    accepts = HeaderAccept([MediaRange('text/html')])
+    assert accepts.accepts('application/json') == Decimal('0')
+
+    accepts.extend([MediaRange('application/json', q='0.5')])
+    assert accepts.accepts('application/json') == Decimal('0.5')
+
+    accepts.remove(MediaRange('application/json', q='0.5'))
+    assert accepts.accepts('application/json') == Decimal('0')
+
+
+def test_HeaderAccept_accepts_malformed():
+    """Assert a malformed Content-Type is not acceptable"""
+    accepts = HeaderAccept([MediaRange('*/*')])
+
+    assert accepts.accepts('text/html;charset') == Decimal('0')
+    assert accepts.accepts('text') == Decimal('0')
+    assert accepts.accepts('') == Decimal('0')
+    assert accepts.accepts('text/html;q=abc') == Decimal('1')
+
+
+def test_HeaderAccept_accepts_parameters():
+    """Assert Content-Type parameters are all matched, q included"""
+    accepts = HeaderAccept([
+        MediaRange('text/plain', q='0.5'),
+        MediaRange('text/plain', q='0.9', profile='a'),
+    ])
+
+    assert accepts.accepts('text/plain;profile=a') == Decimal('0.9')
+    assert accepts.accepts('text/plain;q=0.1;profile=a') == Decimal('0.9')
+    assert accepts.accepts('text/plain;q=0.1') == Decimal('0.5')
+
+
+def test_HeaderAccept_accepts_cache():
+    """Assert Content-Types neither fill the cache nor the pool"""
+    from http_accept import parser
+
+    accepts = HeaderAccept([MediaRange('multipart/form-data')])
+    pool_size = len(parser._media_range_pool)
+
+    for index in range(100):
+        content_type = 'multipart/form-data; boundary=%d' % index
+        assert accepts.accepts(content_type) == Decimal('1')
+        assert len(accepts._accepted) <= accepts.accepts_cache_size
+
+    assert len(parser._media_range_pool) == pool_size
+
+
+def test_HeaderAccept_intersect_refused_wildcard():
+    """Assert refused media-ranges covered by a kept wildcard stay refused"""
+    accepts = HeaderAccept([
+        MediaRange('*/*'),
+        MediaRange('text/html', q='0'),
+    ])
+    upstream = HeaderAccept([
+        MediaRange('text/*'),
+        MediaRange('image/png'),
+    ])
+
+    result = accepts.intersect(upstream)
+
+    assert list(result) == [
+        MediaRange('text/*'),
+        MediaRange('image/png'),
+        MediaRange('text/html', q='0'),
+    ]
+    assert result.accepts('text/html') == Decimal('0')
+    assert result.accepts('text/plain') == Decimal('1')
+
+    # Same when the refusal comes from the upstream side
+    result = upstream.intersect(accepts)
+    assert result.accepts('text/html') == Decimal('0')
+    assert result.accepts('text/plain') == Decimal('1')
+
+
+def test_HeaderAccept_difference_refused():
+    """Assert media-ranges refused by other are in the difference"""
+    accepts = HeaderAccept([MediaRange('*/*')])
+    other = HeaderAccept([
+        MediaRange('text/*'),
+        MediaRange('text/html', q='0'),
+    ])
+
+    result = accepts.difference(other)
+
+    assert list(result) == [
+        MediaRange('*/*'),
+        MediaRange('text/*', q='0'),
+        MediaRange('text/html'),
+    ]
+    assert result.accepts('text/html') == Decimal('1')
+    assert result.accepts('text/plain') == Decimal('0')
+    assert result.accepts('image/png') == Decimal('1')
+
+    # Not when self refuses it too
+    accepts = HeaderAccept([MediaRange('*/*'), MediaRange('text/html', q='0')])
+    result = accepts.difference(other)
+    assert result.accepts('text/html') == Decimal('0')
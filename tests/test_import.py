@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+from pytest import raises  # IGNORE:E0611
+
+import http_accept
+
+
+# Maximum time to import the package, in microseconds
+IMPORT_TIME_LIMIT = 100000
+
+LAZY_MODULES = ['http_accept.negotiation', 'http_accept.stats', 'threading']
+
+
+def run_python(code, *options):
+    """Run code in a new Python process and return its stderr and stdout."""
+    process = subprocess.run(
+        [sys.executable] + list(options) + ['-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True
+    )
+    return process.stderr, process.stdout
+
+
+def test_import_lazy_modules():
+    """Assert optional submodules are not imported with the package"""
+    _, output = run_python(
+        'import sys, http_accept; '
+        'print(\'\\n\'.join(sorted(sys.modules)))'
+    )
+    modules = output.split()
+
+    assert 'http_accept.mediarange' in modules
+    assert 'http_accept.parser' in modules
+    for module in LAZY_MODULES:
+        assert module not in modules
+
+
+def test_import_modules():
+    """Assert the package only imports standard modules besides its own"""
+    _, output = run_python(
+        'import sys; before = set(sys.modules); import http_accept; '
+        'print(\'\\n\'.join(sorted(set(sys.modules) - before)))'
+    )
+
+    for module in output.split():
+        assert module.startswith('http_accept') or \
+            module.split('.')[0] in sys.stdlib_module_names, module
+
+
+def test_import_time():
+    """Assert the package is fast to import
+
+    The cumulative time of the top-level ``http_accept`` import includes the
+    modules it imports. The import is run twice, so the second one does not
+    compile the modules.
+
+    """
+    for _ in range(2):
+        report, _ = run_python('import http_accept', '-X', 'importtime')
+
+    cumulative_time = [
+        int(line.split('|')[1])
+        for line in report.splitlines()
+        if line.split('|')[-1].rstrip() == ' http_accept'
+    ]
+    assert len(cumulative_time) == 1
+    assert 0 < cumulative_time[0] < IMPORT_TIME_LIMIT
+
+
+def test_lazy_attributes():
+    assert http_accept.VariantTable.__module__ == 'http_accept.negotiation'
+    assert http_accept.AcceptStats.__module__ == 'http_accept.stats'
+    assert 'VariantTable' in dir(http_accept)
+
+    with raises(AttributeError):
+        http_accept.DoesNotExist
+
+    # Set on ``http_accept.parser``, not served by the package
+    with raises(AttributeError):
+        http_accept.MEDIA_RANGE_POOL_SIZE
@@ -2,7 +2,7 @@ from decimal import Decimal
 
 from pytest import raises  # IGNORE:E0611
 
-from http_accept import MediaRange
+from http_accept import FrozenMediaRange, MediaRange
 
 
 def test_MediaRange():
@@ -164,3 +164,52 @@ def test_MediaRange_to_http():
     assert accept_xml.to_http() == 'application/xml;q=0.9'
     assert accept_text_level.to_http() == 'text/plain;level=1;version=1.0'
     assert accept_text_level.to_http(explicit_quality=True) == 'text/plain;q=1.0;level=1;version=1.0'
+
+
+def test_MediaRange_to_http_quoted_string():
+    """Assert value.to_http() quotes options which are not tokens"""
+    accept_profile = MediaRange(
+        mimetype='text/html', profile='a, b', title='say "hi"'
+    )
+
+    assert accept_profile.to_http() == (
+        'text/html;profile="a, b";title="say \\"hi\\""'
+    )
+
+
+def test_FrozenMediaRange():
+    """Assert FrozenMediaRange can not be modified"""
+    accept_html = FrozenMediaRange(mimetype='text/html', q='0.8', level='1')
+
+    assert accept_html == MediaRange(mimetype='text/html', q='0.8', level='1')
+    assert accept_html.to_http() == 'text/html;q=0.8;level=1'
+
+    with raises(TypeError):
+        accept_html.mimetype = 'text/plain'
+
+    with raises(TypeError):
+        accept_html.set_options('q', '0.5')
+
+    with raises(TypeError):
+        accept_html.options['level'] = '2'
+
+    assert accept_html.quality == Decimal('0.8')
+    assert accept_html.options == {'level': '1'}
+
+
+def test_FrozenMediaRange_hash():
+    accept_html = FrozenMediaRange(mimetype='text/html', level='1')
+    accept_html_bis = FrozenMediaRange(mimetype='text/html', level='1')
+    accept_html_low = FrozenMediaRange(mimetype='text/html', q='0.8')
+
+    assert hash(accept_html) == hash(accept_html_bis)
+    assert len(set([accept_html, accept_html_bis, accept_html_low])) == 2
+
+
+def test_MediaRange_to_http_quality_decimals():
+    """Assert value.to_http() keeps up to 3 decimals of the quality"""
+    assert MediaRange('text/html', q='0.25').to_http() == 'text/html;q=0.25'
+    assert MediaRange('text/html', q='0.125').to_http() == 'text/html;q=0.125'
+    assert MediaRange('text/html', q='0.1234').to_http() == 'text/html;q=0.123'
+    assert MediaRange('text/html', q='0.500').to_http() == 'text/html;q=0.5'
+    assert MediaRange('text/html', q='0').to_http() == 'text/html;q=0.0'
@@ -0,0 +1,23 @@
+from decimal import Decimal
+
+from http_accept import HeaderAccept, MediaRange, parse_accept_header
+
+
+def test_parse_accept_header():
+    """Assert parse_accept_header basic behavior"""
+    result = parse_accept_header('text/html, application/xml;q=0.8')
+
+    assert isinstance(result, HeaderAccept)
+    assert list(result) == [
+        MediaRange('text/html'),
+        MediaRange('application/xml', q='0.8'),
+    ]
+    assert result.max_quality == Decimal('1')
+
+
+def test_parse_accept_header_shared_media_ranges():
+    """Assert media-ranges are shared between parsed headers"""
+    first = parse_accept_header('text/html, */*;q=0.8')
+    second = parse_accept_header('application/json, */*;q=0.8')
+
+    assert first[1] is second[1]
@@ -51,3 +51,37 @@ def test_parse_accept_value_with_options():
         'options': {'version': '2.4.5', 'custom': '7814'}
     }
     assert parse_accept_value(test_value) == expected
+
+
+def test_parse_accept_value_lowercase():
+    """Assert parse_accept_value lowercases mimetype and option names"""
+    test_value = 'Text/HTML;Q=0.8;Level=A'
+    expected = {
+        'mimetype': 'text/html',
+        'options': {'q': '0.8', 'level': 'A'}
+    }
+    assert parse_accept_value(test_value) == expected
+
+
+def test_parse_accept_value_quoted_string():
+    """Assert parse_accept_value unquotes quoted-string option values"""
+    test_value = 'text/html;profile="a, b; c=d";title="say \\"hi\\""'
+    expected = {
+        'mimetype': 'text/html',
+        'options': {'profile': 'a, b; c=d', 'title': 'say "hi"'}
+    }
+    assert parse_accept_value(test_value) == expected
+
+
+def test_parse_accept_value_without_value():
+    """Assert parse_accept_value raise a ValueError with an option without
+    value"""
+    with raises(ValueError):
+        parse_accept_value('text/html;level')
+
+
+def test_parse_accept_value_empty_mimetype():
+    """Assert parse_accept_value keeps an empty mimetype before options"""
+    expected = {'mimetype': '', 'options': {'q': '0.5'}}
+    assert parse_accept_value(';q=0.5') == expected
+    assert parse_accept_value(' ; q=0.5') == expected
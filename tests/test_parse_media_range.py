@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from http_accept import FrozenMediaRange, MediaRange, parse_media_range
+
+
+def test_parse_media_range():
+    """Assert parse_media_range basic behavior"""
+    result = parse_media_range('Text/HTML;q=0.8;level=1')
+
+    assert isinstance(result, FrozenMediaRange)
+    assert result.mimetype == 'text/html'
+    assert result.quality == Decimal('0.8')
+    assert result.options == {'level': '1'}
+    assert result == MediaRange('text/html', q='0.8', level='1')
+
+
+def test_parse_media_range_shared():
+    """Assert parse_media_range returns the same instance for a value"""
+    result = parse_media_range('application/json')
+
+    assert parse_media_range('application/json') is result
+    assert parse_media_range('application/xml') is not result
+
+
+def test_parse_media_range_normalized_key():
+    """Assert case and whitespace variants share one pooled instance"""
+    from http_accept import parser
+
+    parser._media_range_pool.clear()
+    result = parse_media_range('text/csv;q=0.5;header=present')
+
+    assert parse_media_range('Text/CSV; Q=0.5 ;Header=present') is result
+    assert parse_media_range('text/csv ; q=0.5; header = present') is result
+    assert list(parser._media_range_pool) == ['text/csv;q=0.5;header=present']
+
+    # Option values are case-sensitive
+    assert parse_media_range('text/csv;q=0.5;header=Present') is not result
+
+
+def test_parse_media_range_parsed_key():
+    """Assert quoting and parameter order variants share one pooled
+    instance"""
+    from http_accept import parser
+
+    parser._media_range_pool.clear()
+    result = parse_media_range('text/html;level="1";q=0.5')
+
+    assert parse_media_range('text/html;q=0.5;level=1') is result
+    assert parse_media_range('text/html; Level=1; q="0.5"') is result
+    assert list(parser._media_range_pool) == ['text/html;q=0.5;level=1']
@@ -0,0 +1,164 @@
+from pytest import raises  # IGNORE:E0611
+
+from http_accept import (
+    HeaderAccept, MediaRange, NotAcceptable, RendererRegistry,
+    parse_accept_header, renderers, renders
+)
+
+
+def render_json():
+    return 'json'
+
+
+def render_html():
+    return 'html'
+
+
+def render_text():
+    return 'text'
+
+
+def render_any():
+    return 'any'
+
+
+def test_RendererRegistry():
+    registry = RendererRegistry()
+    registry.register('application/json', render_json)
+    registry.register('text/html', render_html)
+
+    accept = parse_accept_header('text/html;q=0.9, application/json')
+    assert registry.select(accept) == ('application/json', render_json)
+    assert registry.render(accept) == ('application/json', 'json')
+
+    accept = parse_accept_header('text/html, application/json;q=0.9')
+    assert registry.select(accept) == ('text/html', render_html)
+
+    accept = parse_accept_header('image/png')
+    assert registry.select(accept) is None
+    with raises(NotAcceptable):
+        registry.render(accept)
+
+
+def test_RendererRegistry_renders():
+    registry = RendererRegistry()
+
+    @registry.renders('text/html', 'application/xhtml+xml')
+    def render(name):
+        return 'hello %s' % name
+
+    accept = parse_accept_header('application/xhtml+xml')
+    assert registry.render(accept, name='world') == (
+        'application/xhtml+xml', 'hello world'
+    )
+
+
+def test_RendererRegistry_client_wildcard():
+    """Assert a client's wildcard selects the best registered mimetype"""
+    registry = RendererRegistry()
+    registry.register('application/json', render_json)
+    registry.register('text/plain', render_text)
+
+    accept = parse_accept_header('text/*, application/json;q=0.5')
+    assert registry.select(accept) == ('text/plain', render_text)
+
+    # The most specific client's media-range gives the quality
+    accept = parse_accept_header('text/plain;q=0.1, */*;q=0.5')
+    assert registry.select(accept) == ('application/json', render_json)
+
+    # On a tie, the first registered renderer wins
+    accept = parse_accept_header('*/*')
+    assert registry.select(accept) == ('application/json', render_json)
+
+
+def test_RendererRegistry_wildcard():
+    registry = RendererRegistry()
+    registry.register('text/html', render_html)
+    registry.register('text/*', render_text)
+    registry.register('*/*', render_any)
+
+    accept = parse_accept_header('text/csv, text/html;q=0.5')
+    assert registry.select(accept) == ('text/csv', render_text)
+
+    accept = parse_accept_header('text/html, text/csv')
+    assert registry.select(accept) == ('text/html', render_html)
+
+    accept = parse_accept_header('image/png')
+    assert registry.select(accept) == ('image/png', render_any)
+
+
+def test_RendererRegistry_suffix():
+    registry = RendererRegistry()
+    registry.register('*/*+json', render_json)
+    registry.register('application/*', render_any)
+
+    accept = parse_accept_header('application/vnd.api+json')
+    assert registry.select(accept) == ('application/vnd.api+json', render_json)
+
+    accept = parse_accept_header('application/xml')
+    assert registry.select(accept) == ('application/xml', render_any)
+
+    accept = parse_accept_header('text/html')
+    assert registry.select(accept) is None
+
+
+def test_RendererRegistry_options():
+    registry = RendererRegistry()
+    registry.register('text/html', render_html)
+
+    accept = HeaderAccept([MediaRange('text/html', level='1')])
+    assert registry.select(accept) == ('text/html', render_html)
+
+
+def test_RendererRegistry_invalid():
+    registry = RendererRegistry()
+
+    with raises(ValueError):
+        registry.register('json', render_json)
+
+    with raises(ValueError):
+        registry.register('*/json', render_json)
+
+
+def test_RendererRegistry_cache():
+    registry = RendererRegistry(cache_size=2)
+    registry.register('text/html', render_html)
+
+    for header in ('text/html', 'text/*', '*/*', 'text/html'):
+        accept = parse_accept_header(header)
+        assert registry.select(accept) == ('text/html', render_html)
+        assert len(registry._cache) <= 2
+
+    # Registering a renderer drops previous decisions
+    registry.register('text/*', render_text)
+    accept = parse_accept_header('text/plain')
+    assert registry.select(accept) == ('text/plain', render_text)
+
+
+def test_renders():
+    assert renders == renderers.renders
+    assert isinstance(renderers, RendererRegistry)
+
+
+def test_RendererRegistry_wildcard_both_sides():
+    """Assert a wildcard is never selected as the mimetype to render"""
+    registry = RendererRegistry()
+    registry.register('*/*+json', render_json)
+    registry.register('*/*', render_any)
+
+    assert registry.select(parse_accept_header('*/*')) is None
+    assert registry.select(parse_accept_header('text/*')) is None
+    with raises(NotAcceptable):
+        registry.render(parse_accept_header('text/*'))
+
+    # The client's concrete mimetype is rendered, with its quality
+    accept = parse_accept_header('text/*, text/plain;q=0.5')
+    assert registry.select(accept) == ('text/plain', render_any)
+
+    registry.register('text/*', render_text)
+    assert registry.select(parse_accept_header('text/*')) is None
+
+    # A concrete registration serves the client's wildcards
+    registry.register('application/json', render_json)
+    accept = parse_accept_header('*/*')
+    assert registry.select(accept) == ('application/json', render_json)
@@ -0,0 +1,75 @@
+from pytest import raises  # IGNORE:E0611
+
+from http_accept import SpaceSaving
+
+
+def test_SpaceSaving():
+    sketch = SpaceSaving(capacity=3)
+    assert len(sketch) == 0
+    assert sketch.top() == []
+
+    for item in ['a', 'b', 'a', 'c', 'a', 'b']:
+        sketch.add(item)
+
+    assert len(sketch) == 3
+    assert sketch.total == 6
+    assert sketch.top() == [('a', 3, 0), ('b', 2, 0), ('c', 1, 0)]
+    assert sketch.top(2) == [('a', 3, 0), ('b', 2, 0)]
+
+
+def test_SpaceSaving_count():
+    sketch = SpaceSaving(capacity=3)
+    sketch.add('a', 5)
+    sketch.add('b')
+    sketch.add('a', 2)
+
+    assert sketch.total == 8
+    assert sketch.top() == [('a', 7, 0), ('b', 1, 0)]
+
+
+def test_SpaceSaving_eviction():
+    """Assert the lowest count item is replaced once the sketch is full"""
+    sketch = SpaceSaving(capacity=2)
+    for item in ['a', 'a', 'a', 'b', 'c', 'c']:
+        sketch.add(item)
+
+    assert len(sketch) == 2
+    assert sketch.total == 6
+    # 'c' took the place of 'b', and inherited its count as error
+    assert sketch.top() == [('a', 3, 0), ('c', 3, 1)]
+
+
+def test_SpaceSaving_suggested_size():
+    sketch = SpaceSaving(capacity=10)
+    for item, count in [('a', 90), ('b', 6), ('c', 3), ('d', 1)]:
+        sketch.add(item, count)
+
+    assert sketch.suggested_size(0.9) == 1
+    assert sketch.suggested_size(0.95) == 2
+    assert sketch.suggested_size(1) == 4
+
+    sketch = SpaceSaving(capacity=1)
+    for item in ['a', 'b', 'c', 'd']:
+        sketch.add(item)
+
+    assert sketch.suggested_size(0.5) is None
+
+    assert SpaceSaving(capacity=10).suggested_size() == 0
+
+
+def test_SpaceSaving_capacity():
+    with raises(ValueError):
+        SpaceSaving(capacity=0)
+
+
+def test_SpaceSaving_add_count():
+    sketch = SpaceSaving(capacity=2)
+
+    with raises(ValueError):
+        sketch.add('a', 0)
+
+    # Buckets stay ordered whatever the counts
+    for item, count in [('a', 5), ('b', 2), ('b', 4), ('c', 2)]:
+        sketch.add(item, count)
+
+    assert sketch.top() == [('c', 7, 5), ('b', 6, 0)]
@@ -86,3 +86,35 @@ def test_split_accept_header_multiple_values_and_quality():
     assert next(result) == 'application/xml;q=0.8'
     with raises(StopIteration):
         next(result)
+
+
+def test_split_accept_header_quoted_string():
+    """Assert split_accept_header keeps quoted-strings as-is
+
+    Input: 'text/html;profile="a, b; c", application/xml'
+    Output: ['text/html;profile="a, b; c"', 'application/xml']
+
+    """
+    accept_header = 'text/html ; profile = "a, b; c", application/xml'
+    result = split_accept_header(accept_header)
+
+    assert next(result) == 'text/html;profile="a, b; c"'
+    assert next(result) == 'application/xml'
+    with raises(StopIteration):
+        next(result)
+
+
+def test_split_accept_header_empty_elements():
+    """Assert split_accept_header ignores empty elements
+
+    Input: 'text/html, ,application/xml,'
+    Output: ['text/html', 'application/xml']
+
+    """
+    accept_header = 'text/html, ,application/xml,'
+    result = split_accept_header(accept_header)
+
+    assert next(result) == 'text/html'
+    assert next(result) == 'application/xml'
+    with raises(StopIteration):
+        next(result)
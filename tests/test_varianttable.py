@@ -0,0 +1,122 @@
+from http_accept import HeaderAccept, MediaRange, VariantTable
+
+
+def test_VariantTable():
+    table = VariantTable()
+    assert len(table) == 0
+    assert table.select(HeaderAccept([MediaRange('*/*')])) is None
+
+    table.add('index.html', 'text/html')
+    table.add('index.json', 'application/json')
+    assert len(table) == 2
+
+    accept = HeaderAccept([
+        MediaRange('application/json'),
+        MediaRange('text/html', q='0.9'),
+    ])
+    assert table.select(accept) == 'index.json'
+
+    accept = HeaderAccept([MediaRange('image/png')])
+    assert table.select(accept) is None
+
+
+def test_VariantTable_no_header():
+    """Assert the first variant of the best source quality is selected"""
+    table = VariantTable()
+    table.add('index.txt', 'text/plain', quality='0.5')
+    table.add('index.html', 'text/html')
+    table.add('index.xhtml', 'application/xhtml+xml')
+
+    assert table.select() == 'index.html'
+
+
+def test_VariantTable_source_quality():
+    table = VariantTable()
+    table.add('index.html', 'text/html', quality='0.4')
+    table.add('index.txt', 'text/plain')
+
+    accept = HeaderAccept([
+        MediaRange('text/html'),
+        MediaRange('text/plain', q='0.5'),
+    ])
+    assert table.select(accept) == 'index.txt'
+
+    accept = HeaderAccept([
+        MediaRange('text/html'),
+        MediaRange('text/plain', q='0.3'),
+    ])
+    assert table.select(accept) == 'index.html'
+
+
+def test_VariantTable_options():
+    table = VariantTable()
+    table.add('level1.html', 'text/html;level=1', quality='0.9')
+    table.add('level2.html', 'text/html;level=2')
+
+    accept = HeaderAccept([
+        MediaRange('text/html', level='1'),
+        MediaRange('text/html', q='0.5'),
+    ])
+    assert table.select(accept) == 'level1.html'
+
+
+def test_VariantTable_language():
+    table = VariantTable()
+    table.add('index.html.en', 'text/html', language='en-US')
+    table.add('index.html.fr', 'text/html', language='fr')
+    table.add('index.html.de', 'text/html', language='de')
+
+    accept = HeaderAccept([MediaRange('text/html')])
+    accept_language = HeaderAccept([
+        MediaRange('en', q='0.9'),
+        MediaRange('fr', q='0.5'),
+    ])
+    assert table.select(accept, accept_language) == 'index.html.en'
+
+    accept_language = HeaderAccept([
+        MediaRange('en-gb'),
+        MediaRange('*', q='0.1'),
+    ])
+    assert table.select(accept, accept_language) == 'index.html.en'
+
+    accept_language = HeaderAccept([MediaRange('it')])
+    assert table.select(accept, accept_language) is None
+
+
+def test_VariantTable_encoding_and_charset():
+    table = VariantTable()
+    table.add('index.html.gz', 'text/html', encoding='gzip')
+    table.add('index.html.utf8', 'text/html', charset='utf-8',
+              quality='0.9')
+    table.add('index.html', 'text/html', charset='iso-8859-1',
+              quality='0.8')
+
+    accept = HeaderAccept([MediaRange('*/*')])
+    accept_encoding = HeaderAccept([MediaRange('gzip')])
+    accept_charset = HeaderAccept([MediaRange('utf-8', q='0.5')])
+
+    assert table.select(
+        accept, accept_encoding=accept_encoding
+    ) == 'index.html.gz'
+
+    accept_encoding = HeaderAccept([MediaRange('br')])
+    assert table.select(
+        accept, accept_encoding=accept_encoding,
+    ) == 'index.html.utf8'
+
+    # ISO-8859-1 is acceptable unless explicitly mentioned
+    assert table.select(
+        accept,
+        accept_encoding=accept_encoding,
+        accept_charset=accept_charset,
+    ) == 'index.html'
+
+    accept_charset = HeaderAccept([
+        MediaRange('utf-8', q='0.5'),
+        MediaRange('iso-8859-1', q='0'),
+    ])
+    assert table.select(
+        accept,
+        accept_encoding=accept_encoding,
+        accept_charset=accept_charset,
+    ) == 'index.html.utf8'